@@ -21,6 +21,7 @@ NEW CHANGES:
 Dependencies:
   - pigpio (ensure pigpiod is running)
   - pygame (v2.0+ for hot-plug events)
+  - numpy (per-frame channel math)
 
 Author: Your Name
 License: GPL-3.0
@@ -28,9 +29,10 @@ License: GPL-3.0
 
 import sys
 import time
-import os
+import numpy as np
 import pygame
 import pigpio
+import queue
 import threading
 
 # -----------------------------
@@ -46,6 +48,19 @@ MIN_PULSE_US    = 988          # Minimum pulse width (µs)
 MID_PULSE_US    = 1500          # Mid (neutral) pulse width (µs)
 MAX_PULSE_US    = 2012          # Maximum pulse width (µs)
 
+# 1b) OUTPUT PROTOCOL
+# "ppm"  : classic 8-channel PPM stream on PPM_GPIO_PIN.
+# "sbus" : 25-byte SBUS frames (100000 baud, 8E2) on PPM_GPIO_PIN.
+#          SBUS is inverted serial and pigpio outputs normal polarity, so
+#          put a transistor inverter between the pin and the radio.
+# "rp2040": stream 25-byte SBUS frames over USB serial to an external
+#           RP2040 whose PIO generates the pulses with ns-level edge
+#           timing (requires pyserial). pigpio then only drives the
+#           status LEDs.
+OUTPUT_MODE = "ppm"
+RP2040_SERIAL_PORT = "/dev/ttyACM0"  # USB-CDC device of the RP2040
+RP2040_BAUD = 115200
+
 # 2) CHANNEL MAPPINGS (8 channels)
 # Mapping syntax:
 #   "[!]joyX:<control>:<index>"
@@ -68,6 +83,12 @@ CHANNEL_MAP = {
 TRIM = [0, 0, 0, 0, 0, 0, 0, 0]
 EXPO = [0, 0, 0, 0, 0, 0, 0, 0]
 
+# Axis readings within +/- DEADBAND of center are treated as centered.
+# Real sticks rarely rest at exactly 0.0; snapping them to center keeps
+# idle frames identical so unchanged frames can be reused, and still
+# honors trim.
+DEADBAND = 0.02
+
 # 4) LED GPIO PINS
 RED_LED_GPIO   = 22   # Red LED: solid ON when system is initialized
 GREEN_LED_GPIO = 23   # Green LED: blinks while main loop is active
@@ -77,9 +98,88 @@ GREEN_LED_GPIO = 23   # Green LED: blinks while main loop is active
 # -----------------------------
 
 pi = None
-running = True
-joysticks = {}
-last_table_print = 0.0
+rp2040 = None
+_blink_script_id = -1
+joysticks = [None] * 16  # dense table indexed by joystick id
+last_table_print_ns = 0
+
+# Producer/consumer plumbing: the main thread polls joysticks and pushes
+# channel frames; ppm_worker pops them and talks to the pigpio daemon.
+stop_event = threading.Event()
+channel_queue = queue.Queue(maxsize=2)
+
+# Control types for the compiled channel map (see compile_channel_map).
+CT_NONE   = 0
+CT_AXIS   = 1
+CT_BUTTON = 2
+CT_HAT_X  = 3
+CT_HAT_Y  = 4
+
+# Per-channel tuples (invert, control_type, getter, index) built by
+# compile_channel_map(). Indexed by channel number; getter is the bound
+# get_axis/get_button/get_hat method of the mapped joystick.
+_compiled_map = []
+
+# Constants derived from the user configuration. Tuples index faster than
+# lists in CPython, and _EXPO_ACTIVE lets axis_to_us skip the cubic branch
+# entirely for channels with expo disabled (the common case).
+_SCALE = (MAX_PULSE_US - MIN_PULSE_US) * 0.5
+_EXPO = tuple(EXPO)
+_TRIM = tuple(TRIM)
+_EXPO_ACTIVE = tuple(e > 0 for e in EXPO)
+
+# Preallocated arrays for the vectorized per-frame pipeline (poll_channels).
+# _np_trim is rebuilt by compile_channel_map so unmapped channels stay at
+# exactly MID_PULSE_US regardless of their TRIM setting.
+_raw = np.empty(8, dtype=np.float32)
+_out = np.empty(8, dtype=np.uint16)
+# Clamped at 0 so expo <= 0 means "no curve", matching the scalar path.
+_np_expo = np.maximum(np.asarray(EXPO, dtype=np.float32), 0)
+_np_one_minus_expo = 1.0 - _np_expo
+_np_trim = np.zeros(8, dtype=np.float32)
+
+# Preallocated PPM pulse list: odd slots are the constant inter-channel
+# gap pulse, shared across frames; build_ppm_frame rewrites only the even
+# slots (channel high times) and the final sync pulse.
+_PPM_GAP_US = 300  # gap between channels
+_PPM_PIN_MASK = 1 << PPM_GPIO_PIN
+_GAP_PULSE = pigpio.pulse(0, _PPM_PIN_MASK, _PPM_GAP_US)
+_ppm_pulses = [_GAP_PULSE] * 17
+
+# SBUS constants. An SBUS frame is 0x0F, 22 bytes holding 16 11-bit
+# channels LSB-first, a flags byte and a footer. _SBUS_BYTE_SRC lists for
+# each of the 22 channel bytes the (channel, shift) pairs that feed it
+# (negative shift means shift left), so per-frame packing is nothing but
+# shifts and ORs into a preallocated buffer. _SBUS_PARITY is the even
+# parity bit per byte value for the 8E2 serial framing.
+_SBUS_MID = 992
+_SBUS_SCALE = 1600.0 / (MAX_PULSE_US - MIN_PULSE_US)
+_SBUS_BYTE_SRC = tuple(
+    tuple((c, j * 8 - c * 11)
+          for c in range(16)
+          if c * 11 < j * 8 + 8 and c * 11 + 11 > j * 8)
+    for j in range(22)
+)
+_SBUS_PARITY = tuple(bin(b).count("1") & 1 for b in range(256))
+_sbus_buf = bytearray(25)
+_sbus_buf[0] = 0x0F
+
+def _compile_sbus_pack():
+    """
+    Generate a straight-line packer for the fixed SBUS bit layout: one
+    assignment per output byte, no loops or branches at run time. The
+    source is derived from _SBUS_BYTE_SRC so the layout lives in one place.
+    """
+    lines = ["def _pack(c, buf):"]
+    for j, srcs in enumerate(_SBUS_BYTE_SRC):
+        terms = [f"(c[{ch}] >> {s})" if s >= 0 else f"(c[{ch}] << {-s})"
+                 for ch, s in srcs]
+        lines.append(f"    buf[{j + 1}] = ({' | '.join(terms)}) & 0xFF")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_pack"]
+
+_sbus_pack = _compile_sbus_pack()
 
 def init_gpio():
     """Initialize pigpio and configure LED pins."""
@@ -93,6 +193,16 @@ def init_gpio():
     pi.write(RED_LED_GPIO, 0)
     pi.write(GREEN_LED_GPIO, 0)
 
+def init_rp2040():
+    """Open the USB serial link to the RP2040 pulse generator."""
+    global rp2040
+    try:
+        import serial
+    except ImportError:
+        print("Error: pyserial is required for OUTPUT_MODE='rp2040'!")
+        sys.exit(1)
+    rp2040 = serial.Serial(RP2040_SERIAL_PORT, RP2040_BAUD, timeout=0)
+
 def init_joysticks():
     """Initialize pygame and all connected joysticks."""
     pygame.init()
@@ -102,191 +212,426 @@ def init_joysticks():
         for i in range(count):
             js = pygame.joystick.Joystick(i)
             js.init()
-            key = f"joy{i}"
-            joysticks[key] = js
-            print(f"Initialized {key}: {js.get_name()}")
-
-def clear_joysticks():
-    """Clear the joystick dictionary and stop PPM output."""
-    global joysticks
-    joysticks.clear()
-
-def apply_expo(value, expo_factor):
-    """Apply exponential (expo) curve to a normalized value [-1, 1]."""
-    if expo_factor <= 0:
-        return value
-    return (1 - expo_factor) * value + expo_factor * (value ** 3)
+            joysticks[i] = js
+            print(f"Initialized joy{i}: {js.get_name()}")
+    compile_channel_map()
+
+def add_joystick(device_index):
+    """Initialize one newly-plugged joystick without re-enumerating."""
+    js = pygame.joystick.Joystick(device_index)
+    js.init()
+    # SDL fires JOYDEVICEADDED for sticks we already track at startup.
+    instance_id = js.get_instance_id()
+    for slot in joysticks:
+        if slot is not None and slot.get_instance_id() == instance_id:
+            return
+    # Device indices shift down when another stick is removed, so they
+    # can't be used as slots; take the first free one instead.
+    for i, slot in enumerate(joysticks):
+        if slot is None:
+            joysticks[i] = js
+            print(f"Initialized joy{i}: {js.get_name()}")
+            break
+    compile_channel_map()
+
+def remove_joystick(instance_id):
+    """
+    Drop one unplugged joystick by its SDL instance id, leaving the
+    joystick subsystem (and the PPM output) undisturbed.
+    """
+    for i, js in enumerate(joysticks):
+        if js is not None and js.get_instance_id() == instance_id:
+            joysticks[i] = None
+            print(f"Removed joy{i}.")
+            break
+    compile_channel_map()
+
+def compile_channel_map():
+    """
+    Parse CHANNEL_MAP once into per-channel tuples so the per-frame path
+    never touches strings. Each entry is (invert, control_type, getter,
+    index), where getter is the joystick's bound get_axis/get_button/
+    get_hat method - caching it here skips the attribute lookup on every
+    read. Must be re-run whenever joysticks are added or removed.
+    """
+    global _compiled_map
+    compiled = []
+    for ch in range(8):
+        mapping = CHANNEL_MAP.get(ch, "none")
+        invert = mapping.startswith("!")
+        if invert:
+            mapping = mapping[1:]  # Remove '!' prefix
+        parts = mapping.split(":")
+        if mapping == "none" or len(parts) < 2:
+            compiled.append((False, CT_NONE, None, 0))
+            continue
+        try:
+            joy_id = int(parts[0][3:]) if parts[0].startswith("joy") else -1
+        except ValueError:
+            joy_id = -1
+        js = joysticks[joy_id] if 0 <= joy_id < len(joysticks) else None
+        control_type = parts[1]
+        if control_type == "axis":
+            getter = js.get_axis if js is not None else None
+            compiled.append((invert, CT_AXIS, getter, int(parts[2])))
+        elif control_type == "button":
+            getter = js.get_button if js is not None else None
+            compiled.append((invert, CT_BUTTON, getter, int(parts[2])))
+        elif control_type == "hat":
+            subaxis = CT_HAT_X if int(parts[3]) == 0 else CT_HAT_Y
+            getter = js.get_hat if js is not None else None
+            compiled.append((invert, subaxis, getter, int(parts[2])))
+        else:
+            compiled.append((False, CT_NONE, None, 0))
+    _compiled_map = compiled
+    for ch, entry in enumerate(compiled):
+        _np_trim[ch] = _TRIM[ch] if entry[1] != CT_NONE else 0.0
 
 def axis_to_us(axis_value, ch_index):
     """
     Convert an axis value [-1..1] to a pulse width in microseconds,
     applying expo and trim for that channel.
     """
-    adjusted = apply_expo(axis_value, EXPO[ch_index])
-    pulse = (adjusted + 1) * 0.5 * (MAX_PULSE_US - MIN_PULSE_US) + MIN_PULSE_US
-    pulse += TRIM[ch_index]
-    return int(max(MIN_PULSE_US, min(MAX_PULSE_US, pulse)))
+    if _EXPO_ACTIVE[ch_index]:
+        expo = _EXPO[ch_index]
+        axis_value = (1 - expo) * axis_value + expo * (axis_value ** 3)
+    pulse = (axis_value + 1) * _SCALE + MIN_PULSE_US + _TRIM[ch_index]
+    if MIN_PULSE_US <= pulse <= MAX_PULSE_US:
+        return int(pulse)
+    return MIN_PULSE_US if pulse < MIN_PULSE_US else MAX_PULSE_US
 
 def read_channel(ch_index):
     """
-    Read the control value for a channel based on CHANNEL_MAP.
+    Read the control value for a channel from the compiled map.
     Returns the pulse width in µs.
-    If the mapping starts with '!', invert the final normalized value.
     """
-    mapping = CHANNEL_MAP.get(ch_index, "none")
-    if mapping == "none":
+    invert, control_type, getter, idx = _compiled_map[ch_index]
+    if control_type == CT_NONE or getter is None:
         return MID_PULSE_US
 
-    # Check for inversion prefix
-    invert = False
-    if mapping.startswith("!"):
-        invert = True
-        mapping = mapping[1:]  # Remove '!' prefix
-
-    parts = mapping.split(":")
-    if len(parts) < 2:
-        return MID_PULSE_US  # fallback
-
-    joy_key = parts[0]
-    if joy_key not in joysticks:
-        return MID_PULSE_US
-    js = joysticks[joy_key]
-    control_type = parts[1]
-
-    if control_type == "axis":
-        axis_idx = int(parts[2])
-        val = js.get_axis(axis_idx)
-    elif control_type == "button":
-        btn_idx = int(parts[2])
-        val = js.get_button(btn_idx)
+    if control_type == CT_AXIS:
+        val = getter(idx)
+        if -DEADBAND < val < DEADBAND:
+            val = 0.0
+    elif control_type == CT_BUTTON:
         # unpressed = -1, pressed = +1
-        val = (val * 2) - 1
-    elif control_type == "hat":
-        hat_idx = int(parts[2])
-        subaxis = int(parts[3])
-        hx, hy = js.get_hat(hat_idx)
-        val = hx if subaxis == 0 else hy
-    else:
-        val = 0
+        val = getter(idx) * 2 - 1
+    elif control_type == CT_HAT_X:
+        val = getter(idx)[0]
+    else:  # CT_HAT_Y
+        val = getter(idx)[1]
 
     if invert:
         val = -val
 
     return axis_to_us(val, ch_index)
 
+def poll_channels():
+    """
+    Gather the raw value of every channel and convert the whole set to
+    pulse widths in one vectorized pass. The pygame reads stay scalar
+    (they have to), but the expo/scale/trim/clamp arithmetic runs as a
+    handful of NumPy C-loops instead of per-channel Python math.
+    Returns the frame as bytes: 8 packed uint16 pulse widths in µs. The
+    bytes snapshot is what crosses the queue to the worker, so no boxed
+    ints or fresh lists are created per frame.
+    """
+    # Locals are cheaper than module globals in CPython's eval loop.
+    compiled = _compiled_map
+    raw = _raw
+    for ch in range(8):
+        invert, control_type, getter, idx = compiled[ch]
+        if control_type == CT_NONE or getter is None:
+            raw[ch] = 0.0
+            continue
+        if control_type == CT_AXIS:
+            val = getter(idx)
+            if -DEADBAND < val < DEADBAND:
+                val = 0.0
+        elif control_type == CT_BUTTON:
+            val = getter(idx) * 2 - 1
+        elif control_type == CT_HAT_X:
+            val = getter(idx)[0]
+        else:  # CT_HAT_Y
+            val = getter(idx)[1]
+        raw[ch] = -val if invert else val
+
+    adjusted = _np_expo * _raw * _raw * _raw + _np_one_minus_expo * _raw
+    pulses = (adjusted + 1.0) * _SCALE + MIN_PULSE_US + _np_trim
+    np.clip(pulses, MIN_PULSE_US, MAX_PULSE_US, out=pulses)
+    _out[:] = pulses  # truncating cast, same as int()
+    return _out.tobytes()
+
 def build_ppm_frame(channels_us):
     """
     Build a pigpio waveform for a single PPM frame from channel pulse widths.
     """
-    total_channel_time = sum(channels_us)
-    sync_time_us = int(FRAME_LENGTH_MS * 1000 - total_channel_time)
-    pulses = []
-    gap_us = 300  # gap between channels
-
+    pulses = _ppm_pulses
+    make_pulse = pigpio.pulse
+    total_channel_time = 0
+    slot = 0
     for ch_us in channels_us:
-        high_time = max(ch_us - gap_us, 100)
-        pulses.append(pigpio.pulse(1 << PPM_GPIO_PIN, 0, high_time))
-        pulses.append(pigpio.pulse(0, 1 << PPM_GPIO_PIN, gap_us))
+        total_channel_time += ch_us
+        high_time = max(ch_us - _PPM_GAP_US, 100)
+        pulses[slot] = make_pulse(_PPM_PIN_MASK, 0, high_time)
+        slot += 2
 
-    leftover = sync_time_us - (len(channels_us) * gap_us)
+    sync_time_us = int(FRAME_LENGTH_MS * 1000 - total_channel_time)
+    leftover = sync_time_us - (len(channels_us) * _PPM_GAP_US)
     leftover = max(leftover, 8000)
-    pulses.append(pigpio.pulse(0, 1 << PPM_GPIO_PIN, leftover))
-    pi.wave_clear()
+    pulses[slot] = pigpio.pulse(0, _PPM_PIN_MASK, leftover)
     pi.wave_add_generic(pulses)
     return pi.wave_create()
 
+def map_to_sbus(channels_us):
+    """
+    Map channel pulse widths in µs to 11-bit SBUS values. Returns a list
+    of 16 entries; channels beyond the mapped ones are held at mid.
+    """
+    sbus = [_SBUS_MID] * 16
+    for ch, us in enumerate(channels_us):
+        v = int((us - MIN_PULSE_US) * _SBUS_SCALE) + 192
+        sbus[ch] = 0 if v < 0 else (2047 if v > 2047 else v)
+    return sbus
+
+def pack_sbus_frame(channels_us):
+    """
+    Fill the preallocated buffer with the 25-byte SBUS frame for these
+    pulse widths and return it.
+    """
+    _sbus_pack(map_to_sbus(channels_us), _sbus_buf)
+    # _sbus_buf[23] (flags) and _sbus_buf[24] (footer) stay 0.
+    return _sbus_buf
+
+def build_sbus_frame(channels_us):
+    """
+    Pack channel pulse widths into a 25-byte SBUS frame and wrap it in a
+    bit-banged serial waveform (100000 baud, 8E2). Returns the created
+    wave id, like build_ppm_frame.
+    """
+    buf = pack_sbus_frame(channels_us)
+
+    # pigpio takes 9-bit words as two bytes each; the 9th bit carries the
+    # even parity, and bb_stop is given in half-bits (4 = 2 stop bits).
+    words = bytearray(50)
+    for i, b in enumerate(buf):
+        words[2 * i] = b
+        words[2 * i + 1] = _SBUS_PARITY[b]
+    pi.wave_add_serial(PPM_GPIO_PIN, 100000, bytes(words),
+                       bb_bits=9, bb_stop=4)
+    return pi.wave_create()
+
+# ANSI: clear screen and move the cursor home (avoids forking /bin/clear)
+_CLEAR = "\x1b[2J\x1b[H"
+
 def print_table(joystick_count):
     """
     Clear the screen and print a table showing computed PPM channel outputs.
+    The whole table goes out as one write so the terminal updates atomically.
     """
-    os.system('clear')
-    print("PPM Channels Output (µs):")
-    print("------------------------------------------")
-    print(f"{'Ch':<4}{'Mapping':<25}{'Pulse (µs)':>10}")
-    print("------------------------------------------")
+    lines = ["PPM Channels Output (µs):",
+             "------------------------------------------",
+             f"{'Ch':<4}{'Mapping':<25}{'Pulse (µs)':>10}",
+             "------------------------------------------"]
     for ch in range(8):
         mapping = CHANNEL_MAP.get(ch, "none")
         pulse = read_channel(ch)
-        print(f"{ch:<4}{mapping:<25}{pulse:>10}")
-    print("------------------------------------------")
+        lines.append(f"{ch:<4}{mapping:<25}{pulse:>10}")
+    lines.append("------------------------------------------")
     if joystick_count == 0:
-        print("No joystick detected, so no PPM output is sent.\n")
+        lines.append("No joystick detected, so no PPM output is sent.\n")
     else:
-        print("Joystick(s) detected. (Press Ctrl+C to exit)\n")
-
-def green_led_blink():
-    """Blink the green LED continuously while running."""
-    state = 0
-    while running:
-        state = 1 - state
-        pi.write(GREEN_LED_GPIO, state)
-        time.sleep(0.5)
+        lines.append("Joystick(s) detected. (Press Ctrl+C to exit)\n")
+    sys.stdout.write(_CLEAR + "\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def start_green_led_blink():
+    """
+    Blink the green LED from a script stored inside pigpiod, so no Python
+    thread or per-toggle socket call is involved. (The waveform engine is
+    owned by the PPM output and GPIO 23 has no hardware PWM, so a daemon
+    script is the offload that works here.)
+    """
+    global _blink_script_id
+    script = (f"tag 0 w {GREEN_LED_GPIO} 1 mils 500 "
+              f"w {GREEN_LED_GPIO} 0 mils 500 jmp 0")
+    _blink_script_id = pi.store_script(script.encode())
+    # A stored script compiles asynchronously; running it while it is
+    # still initing raises PI_SCRIPT_NOT_READY.
+    while pi.script_status(_blink_script_id)[0] == pigpio.PI_SCRIPT_INITING:
+        time.sleep(0.01)
+    pi.run_script(_blink_script_id)
+
+def stop_green_led_blink():
+    """Stop and delete the blink script and turn the LED off."""
+    if _blink_script_id >= 0:
+        pi.stop_script(_blink_script_id)
+        pi.delete_script(_blink_script_id)
     pi.write(GREEN_LED_GPIO, 0)
 
+def ppm_worker():
+    """
+    Consume channel frames from channel_queue, build the pigpio waveform
+    and submit it. Runs in its own thread so the daemon's socket latency
+    is hidden behind joystick polling in the main thread. If the producer
+    stops feeding frames (all joysticks unplugged), transmission stops by
+    itself once the queued one-shot waves run out.
+    """
+    build_frame = build_sbus_frame if OUTPUT_MODE == "sbus" else build_ppm_frame
+    pending_wids = []
+    last_channels = None
+    while not stop_event.is_set():
+        try:
+            channels = channel_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        # If the producer got ahead, keep only the newest frame.
+        try:
+            while True:
+                channels = channel_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            # Idle sticks produce identical frames; requeue the last wave
+            # instead of rebuilding it so the daemon only gets one call.
+            # The output stays continuous either way.
+            if channels == last_channels and pending_wids:
+                pi.wave_send_using_mode(pending_wids[-1],
+                                        pigpio.WAVE_MODE_ONE_SHOT_SYNC)
+                continue
+            last_channels = channels
+
+            wid = build_frame(memoryview(channels).cast("H"))
+            pi.wave_send_using_mode(wid, pigpio.WAVE_MODE_ONE_SHOT_SYNC)
+            # With one wave playing and this one queued, anything older has
+            # already finished and can be deleted without polling the daemon.
+            pending_wids.append(wid)
+            while len(pending_wids) > 2:
+                pi.wave_delete(pending_wids.pop(0))
+        except Exception as e:
+            # A dead output path must not look healthy from the main loop.
+            print(f"Error: waveform output failed ({e}), shutting down.")
+            stop_event.set()
+
+def rp2040_worker():
+    """
+    Stream channel values to the external RP2040 pulse generator instead
+    of building waves locally. Each frame is one write of a standard
+    25-byte SBUS frame - the 0x0F header and 0x00 footer let the firmware
+    find frame boundaries even when it attaches mid-stream. The RP2040's
+    PIO handles all edge timing, so the frame cadence is the only thing
+    the Pi contributes.
+    """
+    while not stop_event.is_set():
+        try:
+            channels = channel_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        # If the producer got ahead, keep only the newest frame.
+        try:
+            while True:
+                channels = channel_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            rp2040.write(bytes(pack_sbus_frame(memoryview(channels).cast("H"))))
+        except Exception as e:
+            # A dead output path must not look healthy from the main loop.
+            print(f"Error: RP2040 serial output failed ({e}), shutting down.")
+            stop_event.set()
+
 def main():
-    global running, last_table_print
+    global last_table_print_ns
     init_gpio()
 
     pygame.init()
     pygame.joystick.init()
     init_joysticks()
 
+    # Only hot-plug events are read from the queue; block the per-motion
+    # events so SDL never allocates them (get_axis/get_button/get_hat read
+    # the device state directly).
+    pygame.event.set_blocked([pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN,
+                              pygame.JOYBUTTONUP, pygame.JOYHATMOTION])
+
     # Turn RED LED on to show system is up
     pi.write(RED_LED_GPIO, 1)
 
-    # Start blinking GREEN LED in a background thread
-    blink_thread = threading.Thread(target=green_led_blink, daemon=True)
-    blink_thread.start()
+    # Blink the GREEN LED from inside the pigpio daemon
+    start_green_led_blink()
+
+    # Setup the output path: local waveform generation or the RP2040 link
+    if OUTPUT_MODE == "rp2040":
+        init_rp2040()
+        worker = rp2040_worker
+    else:
+        pi.set_mode(PPM_GPIO_PIN, pigpio.OUTPUT)
+        pi.wave_clear()
+        worker = ppm_worker
 
-    # Setup PPM output pin
-    pi.set_mode(PPM_GPIO_PIN, pigpio.OUTPUT)
+    # Start the frame builder/submitter thread
+    ppm_thread = threading.Thread(target=worker, daemon=True)
+    ppm_thread.start()
 
     print("PPM generation logic started. Press Ctrl+C to exit.")
-    last_table_print = time.time()
+    last_table_print_ns = time.monotonic_ns()
+    frame_period_ns = int(FRAME_LENGTH_MS * 1_000_000)
+    next_frame_ns = time.monotonic_ns()
 
     try:
-        while True:
+        while not stop_event.is_set():
             pygame.event.pump()
 
-            # Handle hotplug/unplug events
-            for event in pygame.event.get():
+            # Handle hotplug/unplug events; everything else stays out of
+            # the queue so this never iterates over axis motion spam.
+            for event in pygame.event.get([pygame.JOYDEVICEADDED,
+                                           pygame.JOYDEVICEREMOVED]):
                 if event.type == pygame.JOYDEVICEADDED:
-                    print("Joystick added.")
-                    init_joysticks()
+                    add_joystick(event.device_index)
                 elif event.type == pygame.JOYDEVICEREMOVED:
-                    print("Joystick removed.")
-                    pygame.joystick.quit()
-                    pygame.joystick.init()
-                    clear_joysticks()
-                    init_joysticks()
+                    remove_joystick(event.instance_id)
 
             count = pygame.joystick.get_count()
             # If no joystick is connected, do not send PPM (transmitter regains control)
             if count == 0:
-                if VERBOSE and (time.time() - last_table_print >= 0.5):
-                    last_table_print = time.time()
+                if VERBOSE and (time.monotonic_ns() - last_table_print_ns
+                                >= 500_000_000):
+                    last_table_print_ns = time.monotonic_ns()
                     print_table(count)
                 time.sleep(0.1)
+                next_frame_ns = time.monotonic_ns()
                 continue
 
-            channels = [read_channel(ch) for ch in range(8)]
-            wid = build_ppm_frame(channels)
-            pi.wave_send_once(wid)
-            while pi.wave_tx_busy():
-                time.sleep(0.001)
-            pi.wave_delete(wid)
+            channels = poll_channels()
+            try:
+                channel_queue.put_nowait(channels)
+            except queue.Full:
+                pass  # worker is behind; it keeps only the newest anyway
 
-            if VERBOSE and (time.time() - last_table_print >= 0.5):
-                last_table_print = time.time()
+            if VERBOSE and (time.monotonic_ns() - last_table_print_ns
+                            >= 500_000_000):
+                last_table_print_ns = time.monotonic_ns()
                 print_table(count)
 
+            # Steady polling cadence; the worker and the pigpio daemon
+            # take care of frame-to-frame continuity.
+            next_frame_ns += frame_period_ns
+            delay_ns = next_frame_ns - time.monotonic_ns()
+            if delay_ns > 0:
+                time.sleep(delay_ns * 1e-9)
+            elif delay_ns < -frame_period_ns:
+                next_frame_ns = time.monotonic_ns()  # fell behind, resync
+
     except KeyboardInterrupt:
         print("\nExiting...")
     finally:
-        running = False
-        blink_thread.join()
+        stop_event.set()
+        ppm_thread.join()
+        if rp2040 is not None:
+            rp2040.close()
+        stop_green_led_blink()
         pi.write(RED_LED_GPIO, 0)
-        pi.write(GREEN_LED_GPIO, 0)
         pi.wave_clear()
         pi.stop()
         pygame.quit()